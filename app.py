@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import json
 import os
+import uuid
 from typing import Dict
 
 import pandas as pd
@@ -11,16 +11,22 @@ import streamlit as st
 
 from prompts import parsing_prompt
 from utils import (
+    LLM_FALLBACK_NOTE,
+    PRE_RANK_TOP_K,
     CVProfile,
     ModelConfig,
     build_candidate_table,
     demo_profile,
-    generate_match_report,
-    generate_outreach,
-    heuristic_extract,
-    llm_structured_parse,
+    embed_profiles,
+    extract_profile,
+    generate_match_reports_batched,
     load_pdf_text,
+    parse_match_report,
+    rank_candidates,
+    stream_match_report,
+    stream_outreach,
 )
+from store import ProfileStore, content_hash
 
 
 st.set_page_config(page_title="Academic Talent AI Agent", layout="wide")
@@ -49,15 +55,40 @@ with st.sidebar:
     )
 
 
+@st.cache_resource
+def get_store() -> ProfileStore:
+    return ProfileStore()
+
+
 def ensure_state():
     if "profiles" not in st.session_state:
-        st.session_state["profiles"] = {}
+        st.session_state["profiles"] = get_store().all_profiles()
+        st.session_state["profiles_version"] = uuid.uuid4().hex
     if "analysis" not in st.session_state:
         st.session_state["analysis"] = {}
+    if "embeddings" not in st.session_state:
+        st.session_state["embeddings"] = {}
 
 
 def add_profile(name: str, profile: CVProfile):
     st.session_state["profiles"][name] = profile
+    st.session_state["embeddings"].pop(name, None)
+    # Unique per change and per session, so the shared table cache never serves another session's data.
+    st.session_state["profiles_version"] = uuid.uuid4().hex
+
+
+def save_analysis(name: str, profile: CVProfile, target: str, config: ModelConfig, report: Dict):
+    st.session_state["analysis"][name] = report
+    # Only well-formed reports are worth replaying after a restart.
+    if report.get("suitability_score") != "N/A":
+        get_store().put_analysis(profile, target, config, report)
+
+
+def parsed_candidates():
+    if st.session_state["profiles"]:
+        st.markdown("### Parsed Candidates")
+        table = build_candidate_table(st.session_state["profiles"], st.session_state["profiles_version"])
+        st.dataframe(table, use_container_width=True)
 
 
 ensure_state()
@@ -87,26 +118,29 @@ with resume_tab:
                 st.error("Provide an API key or disable LLM parsing.")
             else:
                 with st.spinner("Extracting CV details..."):
-                    raw_text = load_pdf_text(uploaded)
-                    profile = heuristic_extract(raw_text)
-                    if use_llm and api_key:
-                        config = ModelConfig(provider=provider, model=model_name, api_key=api_key)
-                        profile = llm_structured_parse(raw_text, config)
+                    file_bytes = uploaded.getvalue()
+                    file_hash = content_hash(file_bytes)
+                    method = "llm" if use_llm else "heuristic"
+                    config = ModelConfig(provider=provider, model=model_name, api_key=api_key) if use_llm else None
+                    profile = get_store().get_profile(file_hash, method, config)
+                    if profile is None:
+                        raw_text = load_pdf_text(file_bytes)
+                        profile = extract_profile(raw_text, config)
                     if candidate_name:
                         profile.name = candidate_name
+                    if not profile.notes.endswith(LLM_FALLBACK_NOTE):
+                        get_store().put_profile(file_hash, method, config, profile)
                     add_profile(profile.name, profile)
                     st.success(f"Parsed profile saved for {profile.name}")
-                    st.json(json.loads(profile.json()))
+                    st.json(profile.model_dump())
     with col2:
         if st.button("Load demo profile"):
             profile = demo_profile()
             add_profile(profile.name, profile)
             st.success("Demo profile added. You can skip PDF upload and continue to Matching/Outreach.")
-            st.json(json.loads(profile.json()))
+            st.json(profile.model_dump())
 
-    if st.session_state["profiles"]:
-        st.markdown("### Parsed Candidates")
-        st.dataframe(build_candidate_table(st.session_state["profiles"]), use_container_width=True)
+    parsed_candidates()
 
 with match_tab:
     st.subheader("Talent Matching & Scoring")
@@ -128,10 +162,54 @@ with match_tab:
                 with st.spinner("Generating match report..."):
                     config = ModelConfig(provider=provider, model=model_name, api_key=api_key)
                     profile = st.session_state["profiles"][selected]
-                    report = generate_match_report(profile, target_direction, config)
-                    st.session_state["analysis"][selected] = report
+                    live_output = st.empty()
+                    report = get_store().get_analysis(profile, target_direction, config)
+                    if report is None:
+                        with live_output.container():
+                            raw_report = st.write_stream(stream_match_report(profile, target_direction, config))
+                        report = parse_match_report(raw_report)
+                    save_analysis(selected, profile, target_direction, config, report)
                     st.success("Analysis ready")
-                    st.json(report)
+                    live_output.json(report)
+        if st.button("Score top candidates"):
+            if not api_key:
+                st.error("API key required for LLM analysis.")
+            elif not target_direction.strip():
+                st.error("Please enter a target research direction.")
+            else:
+                with st.spinner("Ranking and scoring candidates..."):
+                    config = ModelConfig(provider=provider, model=model_name, api_key=api_key)
+                    profiles = st.session_state["profiles"]
+                    shortlist = profiles
+                    if len(profiles) > PRE_RANK_TOP_K:
+                        # Embedding similarity is cheap; only the closest candidates pay for an LLM report.
+                        missing = {name: p for name, p in profiles.items() if name not in st.session_state["embeddings"]}
+                        st.session_state["embeddings"].update(embed_profiles(missing, config))
+                        ranking = rank_candidates(st.session_state["embeddings"], target_direction, config)
+                        if ranking:
+                            st.markdown("#### Similarity pre-ranking")
+                            st.dataframe(pd.DataFrame(ranking, columns=["Name", "Similarity"]), use_container_width=True)
+                            shortlist = {name: profiles[name] for name, _ in ranking[:PRE_RANK_TOP_K]}
+                    reports = {}
+                    for name, profile in shortlist.items():
+                        stored = get_store().get_analysis(profile, target_direction, config)
+                        if stored is not None:
+                            reports[name] = stored
+                    pending = {name: profile for name, profile in shortlist.items() if name not in reports}
+                    if pending:
+                        reports.update(generate_match_reports_batched(pending, target_direction, config))
+                    for name, report in reports.items():
+                        save_analysis(name, shortlist[name], target_direction, config, report)
+                    st.success(f"Scored {len(reports)} candidates")
+                    st.dataframe(
+                        pd.DataFrame(
+                            [
+                                {"Name": name, "Score": report.get("suitability_score"), "Reasoning": report.get("reasoning")}
+                                for name, report in reports.items()
+                            ]
+                        ),
+                        use_container_width=True,
+                    )
 
 with outreach_tab:
     st.subheader("Hyper-Personalized Outreach Generator")
@@ -155,9 +233,8 @@ with outreach_tab:
                     if not profile:
                         st.error("Profile missing. Please rerun analysis.")
                     else:
-                        email = generate_outreach(profile, institute_value, language, config)
+                        st.write_stream(stream_outreach(profile, institute_value, language, config))
                         st.success("Draft ready")
-                        st.code(email, language="markdown")
 
 
 st.markdown(
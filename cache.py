@@ -0,0 +1,58 @@
+"""Exact-match response cache for LLM calls, persisted to a local SQLite file."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """SHA-256 keyed cache of LLM responses.
+
+    Entries are grouped by ``namespace`` (provider, model, system prompt and the
+    caller's exact task inputs), so a payload only ever matches a response produced
+    for the same task, target and candidate.
+    """
+
+    def __init__(self, path: str = "llm_cache.db"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exact_responses (
+                namespace TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                PRIMARY KEY (namespace, prompt_hash)
+            )
+            """
+        )
+        self._conn.commit()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        rows = self._conn.execute("SELECT namespace, prompt_hash, response FROM exact_responses")
+        for namespace, prompt_hash, response in rows:
+            self._entries.setdefault(namespace, {})[prompt_hash] = response
+
+    @staticmethod
+    def hash_prompt(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, prompt: str) -> Optional[str]:
+        """Return the cached response for exactly ``prompt`` in ``namespace``, if any."""
+
+        with self._lock:
+            return self._entries.get(namespace, {}).get(self.hash_prompt(prompt))
+
+    def put(self, namespace: str, prompt: str, response: str) -> None:
+        """Store ``response`` for ``prompt`` in memory and on disk."""
+
+        prompt_hash = self.hash_prompt(prompt)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO exact_responses VALUES (?, ?, ?)",
+                (namespace, prompt_hash, response),
+            )
+            self._conn.commit()
+            self._entries.setdefault(namespace, {})[prompt_hash] = response
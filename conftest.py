@@ -0,0 +1 @@
+"""Lets pytest import the top-level app modules (``utils``, ``prompts``) from ``tests/``."""
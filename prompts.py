@@ -1,8 +1,108 @@
-"""Prompt templates for the AI agent."""
+"""Prompt templates for the AI agent.
+
+Each task is split into a static system preamble, a shared context (target
+direction or institute pitch) and a per-candidate payload, assembled in that
+order. Everything before the candidate data repeats across a recruiting run,
+so providers can cache it as a prompt prefix (Anthropic ``cache_control``
+blocks, OpenAI automatic caching).
+"""
 
 from textwrap import dedent
 
 
+def reference_guide() -> str:
+    """Field definitions and worked examples shared by every system prompt.
+
+    Besides grounding the model, this keeps each preamble above the providers'
+    minimum cacheable prefix length (1024 tokens for most Anthropic and OpenAI models).
+    """
+
+    return dedent(
+        """
+        ## Reference material
+        Everything in this section is illustrative. Never copy example values into an answer about a real candidate.
+
+        ### Profile fields
+        - name: the candidate's full name as printed in the CV header, including the title (Dr., Prof.) when given.
+        - current_institution: the most recent employer or host institution. Prefer the university or institute
+          over the department; include the department only when no parent institution is named.
+        - estimated_ranking: a coarse global standing of current_institution, e.g. "Top 20 globally",
+          "Top 100 globally", "Leading national institute". Use N/A when the institution is unfamiliar.
+        - h_index: the h-index exactly as stated in the CV, as a string. Do not estimate it from a publication list.
+        - research_focus_keywords: 3-10 short phrases describing diseases, systems or methods the candidate works on,
+          ordered from most to least central. Prefer specific terms ("tumor microenvironment", "CAR-T") over generic
+          ones ("biology", "research").
+        - key_publications: up to 8 of the most notable papers, preferring high-tier journals and recent years.
+          Each item has title, journal and year (integer or null). Use the journal's common short name.
+        - grants: competitive funding where the candidate is PI or co-PI. Each item has title, amount (string with
+          currency, e.g. "$1.2M", "¥3M"), year (integer or null) and sponsor (e.g. NIH, NSFC, ERC, Wellcome).
+        - notes: one or two sentences on anything a recruiter should know that the other fields miss, such as a
+          pending move, clinical duties, or an industry appointment.
+
+        ### Journal tiers
+        - Tier 1: Nature, Science, Cell, The Lancet, New England Journal of Medicine.
+        - Tier 1 family: Nature Medicine, Nature Immunology, Nature Genetics, Nature Biotechnology, Cancer Cell,
+          Cell Stem Cell, Immunity, Science Translational Medicine, The Lancet Oncology.
+        - Tier 2: JAMA, BMJ, PNAS, Nature Communications, Cell Reports, Journal of Clinical Investigation, eLife.
+        - Treat preprints (bioRxiv, medRxiv) as supporting evidence only, never as a key publication on their own.
+        First-author and corresponding-author papers weigh more than middle-author contributions.
+
+        ### Handling incomplete or ambiguous CVs
+        - CV text is extracted from PDFs and may contain broken lines, merged columns, page headers and footers,
+          or hyphenated words split across lines. Reassemble them before interpreting the content.
+        - When the same paper appears in several sections, count it once and keep the most complete citation.
+        - When dates conflict, trust the most detailed entry (month and year over year only).
+        - Do not infer gender, age, nationality or family status, and never use them in any judgement.
+        - Chinese and English CVs are both common. Keep proper nouns in their original script when no standard
+          English form exists, and translate section headings only for your own understanding.
+        - Funding amounts may be written in different currencies or units (万元, RMB, USD, EUR). Keep the original
+          currency rather than converting it.
+        - If a field is genuinely absent, say so with N/A or an empty list instead of guessing.
+
+        ### Tone and language
+        - Recruiters read these outputs quickly. Prefer short, specific statements over general praise.
+        - Refer to the candidate by title and surname (e.g. "Dr. Lee") rather than by first name.
+        - When asked for Chinese output, use formal written Chinese (书面语) suitable for an academic invitation.
+        - Never invent achievements, affiliations, awards or numbers that are not present in the provided data.
+
+        ### Worked example: CV excerpt
+        Dr. Morgan Lee, Assistant Professor, Department of Medicine, Karolinska Institutet (2020-present).
+        Postdoctoral fellow, Broad Institute of MIT and Harvard (2015-2020). PhD Genetics, University of Cambridge.
+        Research: functional genomics of heart failure; CRISPR screens for cardiomyocyte regeneration.
+        Selected publications: Genome-wide CRISPR screen of cardiomyocyte proliferation. Cell, 2022 (first author).
+        Polygenic risk and heart failure outcomes. Nature Genetics, 2024 (corresponding author).
+        Funding: ERC Starting Grant, €1.5M, 2021. Swedish Research Council project grant, SEK 4M, 2023.
+        Scopus h-index: 27.
+
+        ### Worked example: parsed profile
+        {"name": "Dr. Morgan Lee",
+         "current_institution": "Karolinska Institutet",
+         "estimated_ranking": "Top 50 globally",
+         "h_index": "27",
+         "research_focus_keywords": ["Heart failure", "Functional genomics", "CRISPR screens", "Cardiac regeneration"],
+         "key_publications": [
+           {"title": "Genome-wide CRISPR screen of cardiomyocyte proliferation", "journal": "Cell", "year": 2022},
+           {"title": "Polygenic risk and heart failure outcomes", "journal": "Nature Genetics", "year": 2024}],
+         "grants": [
+           {"title": "ERC Starting Grant", "amount": "€1.5M", "year": 2021, "sponsor": "ERC"},
+           {"title": "Swedish Research Council project grant", "amount": "SEK 4M", "year": 2023, "sponsor": "VR"}],
+         "notes": "Independent PI since 2020 with European and national funding."}
+
+        ### Worked example: match report for "Cardiovascular genetics and regenerative medicine"
+        {"suitability_score": 86,
+         "reasoning": "Dr. Lee's program on the functional genomics of heart failure matches the target area, backed by a first-author Cell paper, a corresponding-author Nature Genetics paper and an ERC Starting Grant.",
+         "strengths": ["Tier 1 and Tier 1 family papers as first and corresponding author", "CRISPR screening platform directly applicable", "Competitive European funding as PI"],
+         "gaps": ["No clinical trial involvement listed", "Group leadership record is still short"],
+         "recommended_projects": ["In vivo CRISPR screen for regenerative targets after myocardial infarction", "Linking polygenic risk scores to cardiomyocyte phenotypes in patient-derived cells"]}
+
+        ### Worked example: outreach opening
+        Dear Dr. Lee, your recent Nature Genetics paper on polygenic risk and heart failure outcomes has been widely
+        discussed by our cardiovascular faculty. Its bridge between human genetics and cardiomyocyte biology matches the
+        regenerative medicine program we are building, and we would welcome a conversation about leading a group here.
+        """
+    ).strip()
+
+
 def parsing_prompt() -> str:
     """Prompt guiding the LLM to extract academic CV details."""
 
@@ -14,37 +114,94 @@ def parsing_prompt() -> str:
         grants (list of {title, amount, year, sponsor}), notes.
 
         Journals of interest include Nature, Science, Cell, and The Lancet. Use N/A when not found.
+        Follow the field definitions below and return only the JSON object.
         """
-    ).strip()
+    ).strip() + "\n\n" + reference_guide()
 
 
-def matching_prompt(cv_summary: str, target_direction: str) -> str:
-    """Prompt used to score candidate fit against a research direction."""
+def matching_system_prompt() -> str:
+    """Static instructions used to score candidate fit against a research direction."""
 
     return dedent(
-        f"""
+        """
         You are assisting a medical research institute to evaluate faculty candidates.
-        Consider the following parsed CV data:\n{cv_summary}\n
-        Target research direction: {target_direction}
+        You will receive parsed CV data as JSON and a target research direction.
 
         Provide a JSON with: suitability_score (0-100), reasoning (2-3 sentences),
         strengths (list), gaps (list), recommended_projects (list of short ideas).
+
+        Scoring rubric:
+        - 90-100: core research focus matches the direction, with first/corresponding-author papers
+          in Nature, Science, Cell, or The Lancet family journals and independent grant funding.
+        - 75-89: strong overlap in methods or disease area, high-impact publications in adjacent fields,
+          and a clear path to leading a group in the target direction.
+        - 60-74: partial overlap; transferable techniques (e.g. single-cell, CRISPR screens, cohort studies)
+          but limited track record on the target topic.
+        - 40-59: tangential fit; the candidate would need substantial retooling.
+        - 0-39: little or no connection to the target direction.
+
+        Weigh evidence in this order: topical fit of recent publications, journal tier and authorship,
+        competitive funding as PI, h-index relative to career stage, institutional pedigree.
+        Treat N/A fields as missing evidence rather than as negative evidence.
+        Keep strengths and gaps concrete and tied to items in the CV data.
         """
-    ).strip()
+    ).strip() + "\n\n" + reference_guide()
+
+
+def matching_context(target_direction: str) -> str:
+    """Target direction shared by every candidate scored in a run."""
 
+    return f"Target research direction: {target_direction}"
 
-def outreach_prompt(candidate_profile: str, institute_value: str, language: str = "English") -> str:
-    """Prompt to produce a personalized outreach email."""
+
+def matching_payload(cv_summary: str) -> str:
+    """Candidate data appended after the matching instructions and target direction."""
+
+    return f"Parsed CV data:\n{cv_summary}"
+
+
+def batch_matching_system_prompt() -> str:
+    """Static instructions for scoring several candidates in one request."""
 
     return dedent(
-        f"""
-        Write a concise, respectful outreach email to a senior scientist about joining our institute.
-        Use an academic tone and reference specific achievements from the profile below.
+        """
+        You will receive a JSON array of candidates, each as {"id": <int>, "cv": <parsed CV data>}.
+        Evaluate every candidate independently against the same target research direction.
+        Return only a JSON object of the form {"results": [...]}, with one entry per candidate
+        containing the candidate's id plus the fields described below.
+        """
+    ).strip() + "\n\n" + matching_system_prompt()
+
+
+def batch_matching_payload(candidates: str) -> str:
+    """Batch of candidates appended after the batch matching instructions and target direction."""
 
-        Candidate profile:\n{candidate_profile}\n
-        Institute value proposition: {institute_value}
-        Language: {language}
+    return f"Candidates:\n{candidates}"
+
+
+def outreach_system_prompt() -> str:
+    """Static instructions used to produce a personalized outreach email."""
+
+    return dedent(
+        """
+        Write a concise, respectful outreach email to a senior scientist about joining our institute.
+        Use an academic tone and reference specific achievements from the candidate profile provided.
 
         Include a specific paper or grant mention to prove personalization.
+        Write the email in the requested language.
+        Return only the email (subject line, greeting, body, sign-off) with no commentary.
         """
-    ).strip()
+    ).strip() + "\n\n" + reference_guide()
+
+
+def outreach_context(institute_value: str, language: str = "English") -> str:
+    """Institute pitch and language shared by every outreach email in a run."""
+
+    return f"Institute value proposition: {institute_value}\nLanguage: {language}"
+
+
+def outreach_payload(candidate_profile: str) -> str:
+    """Candidate data appended after the outreach instructions and institute context."""
+
+    return f"Candidate profile:\n{candidate_profile}"
+
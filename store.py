@@ -0,0 +1,100 @@
+"""Persistent SQLite store for parsed profiles and match reports."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+from utils import CVProfile, ModelConfig
+
+
+def content_hash(data: bytes | str) -> str:
+    """SHA-256 hex digest of raw bytes or UTF-8 text."""
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _model_key(config: Optional[ModelConfig]) -> Tuple[str, str]:
+    """Provider and model that produced a record; empty for heuristic parses."""
+
+    return (config.provider, config.model) if config else ("", "")
+
+
+class ProfileStore:
+    """Keeps parsed CVs and match reports across server restarts.
+
+    Records are keyed by the provider and model that produced them, so switching models
+    never replays another model's output.
+    """
+
+    def __init__(self, path: str = "profiles.db"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS parsed_profiles (
+                file_hash TEXT NOT NULL,
+                method TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                name TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (file_hash, method, provider, model)
+            );
+            CREATE TABLE IF NOT EXISTS match_analyses (
+                profile_hash TEXT NOT NULL,
+                target_hash TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (profile_hash, target_hash, provider, model)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_profile(self, file_hash: str, method: str, config: Optional[ModelConfig]) -> Optional[CVProfile]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM parsed_profiles WHERE file_hash = ? AND method = ? AND provider = ? AND model = ?",
+                (file_hash, method, *_model_key(config)),
+            ).fetchone()
+        return CVProfile.model_validate_json(row[0]) if row else None
+
+    def put_profile(self, file_hash: str, method: str, config: Optional[ModelConfig], profile: CVProfile) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_profiles VALUES (?, ?, ?, ?, ?, ?)",
+                (file_hash, method, *_model_key(config), profile.name, profile.model_dump_json()),
+            )
+            self._conn.commit()
+
+    def all_profiles(self) -> Dict[str, CVProfile]:
+        """Every stored profile keyed by candidate name; later parses win on name clashes."""
+
+        with self._lock:
+            rows = self._conn.execute("SELECT name, payload FROM parsed_profiles ORDER BY rowid").fetchall()
+        return {name: CVProfile.model_validate_json(payload) for name, payload in rows}
+
+    def get_analysis(self, profile: CVProfile, target: str, config: ModelConfig) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM match_analyses"
+                " WHERE profile_hash = ? AND target_hash = ? AND provider = ? AND model = ?",
+                (content_hash(profile.summary), content_hash(target), *_model_key(config)),
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def put_analysis(self, profile: CVProfile, target: str, config: ModelConfig, report: Dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO match_analyses VALUES (?, ?, ?, ?, ?)",
+                (content_hash(profile.summary), content_hash(target), *_model_key(config), orjson.dumps(report)),
+            )
+            self._conn.commit()
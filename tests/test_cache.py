@@ -0,0 +1,32 @@
+from cache import ResponseCache
+
+
+def test_get_returns_stored_response(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("ns", "prompt", "answer")
+    assert cache.get("ns", "prompt") == "answer"
+
+
+def test_miss_returns_none(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("ns", "prompt", "answer")
+    assert cache.get("ns", "other prompt") is None
+
+
+def test_namespaces_are_isolated(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("openai:gpt-4o", "prompt", "answer")
+    assert cache.get("anthropic:claude-3-5-sonnet-20240620", "prompt") is None
+
+
+def test_put_overwrites_existing_entry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("ns", "prompt", "old")
+    cache.put("ns", "prompt", "new")
+    assert cache.get("ns", "prompt") == "new"
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(path).put("ns", "prompt", "answer")
+    assert ResponseCache(path).get("ns", "prompt") == "answer"
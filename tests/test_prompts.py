@@ -0,0 +1,36 @@
+import re
+
+import orjson
+import pytest
+import tiktoken
+
+import prompts
+from utils import demo_profile
+
+# Providers only cache prompt prefixes at or above this length.
+MIN_CACHEABLE_TOKENS = 1024
+
+
+@pytest.mark.parametrize(
+    "system_prompt",
+    [
+        prompts.parsing_prompt,
+        prompts.matching_system_prompt,
+        prompts.batch_matching_system_prompt,
+        prompts.outreach_system_prompt,
+    ],
+)
+def test_system_prompts_clear_cache_minimum(system_prompt):
+    enc = tiktoken.get_encoding("cl100k_base")
+    assert len(enc.encode(system_prompt())) >= MIN_CACHEABLE_TOKENS
+
+
+def test_worked_examples_are_valid_json():
+    examples = re.findall(r"### Worked example: [^\n]*\n(\{.*?\})\n\n", prompts.reference_guide(), re.S)
+    assert len(examples) == 2
+    for example in examples:
+        assert isinstance(orjson.loads(example), dict)
+
+
+def test_worked_examples_do_not_reuse_demo_profile():
+    assert demo_profile().name not in prompts.reference_guide()
@@ -0,0 +1,67 @@
+import pytest
+
+import utils
+
+
+class WordEncoding:
+    """Stand-in tokenizer: one token per whitespace-separated word."""
+
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+
+@pytest.fixture(autouse=True)
+def word_encoding(monkeypatch):
+    monkeypatch.setattr(utils, "_encoding", lambda model: WordEncoding())
+
+
+def test_truncate_keeps_text_that_fits():
+    text = "Header line\n\nEducation\nPhD"
+    assert utils.truncate_to_tokens(text, "gpt-4o", max_tokens=10) == text
+
+
+def test_truncate_fills_budget_from_overflowing_section():
+    header = "Dr. Ada Zhang"
+    body = "\n".join(f"Paper {i} title" for i in range(100))
+    result = utils.truncate_to_tokens(f"{header}\n\n{body}\n\nGrants\nNSFC", "gpt-4o", max_tokens=12)
+
+    assert result == "Dr. Ada Zhang\n\nPaper 0 title\nPaper 1 title\nPaper 2 title"
+
+
+def test_truncate_cuts_single_oversized_line():
+    text = " ".join(f"w{i}" for i in range(20))
+    assert utils.truncate_to_tokens(text, "gpt-4o", max_tokens=5) == "w0 w1 w2 w3 w4"
+
+
+def test_parse_batch_maps_ids_to_reports():
+    content = '{"results": [{"id": 1, "suitability_score": 70}, {"id": 0, "suitability_score": 90}]}'
+    assert utils._parse_batch(content) == {0: {"suitability_score": 90}, 1: {"suitability_score": 70}}
+
+
+def test_parse_batch_skips_items_without_usable_id():
+    content = '{"results": [{"suitability_score": 10}, "oops", {"id": "x"}, {"id": 2, "suitability_score": 80}]}'
+    assert utils._parse_batch(content) == {2: {"suitability_score": 80}}
+
+
+def test_parse_batch_keeps_short_results_list():
+    content = '{"results": [{"id": 0, "suitability_score": 55}]}'
+    assert utils._parse_batch(content) == {0: {"suitability_score": 55}}
+
+
+@pytest.mark.parametrize("content", ["not json", "[]", '"text"', '{"results": {"id": 0}}', "{}"])
+def test_parse_batch_returns_empty_for_malformed_response(content):
+    assert utils._parse_batch(content) == {}
+
+
+def test_parse_match_report_decodes_object():
+    assert utils.parse_match_report('{"suitability_score": 88}') == {"suitability_score": 88}
+
+
+@pytest.mark.parametrize("content", ["not json", '["a", "b"]', "42"])
+def test_parse_match_report_falls_back_for_non_object(content):
+    report = utils.parse_match_report(content)
+    assert report["suitability_score"] == "N/A"
+    assert report["reasoning"] == content
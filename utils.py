@@ -2,19 +2,49 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import io
 import re
+import threading
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Literal, Optional, Tuple, TypeVar
 
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
+import streamlit as st
+import tiktoken
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from pydantic import BaseModel, Field
-from PyPDF2 import PdfReader
 
 import prompts
+from cache import ResponseCache
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # pragma: no cover - PyPDF2 fallback
+    fitz = None
+    from PyPDF2 import PdfReader
+
+# Upper bound on in-flight LLM requests, to stay under provider rate limits.
+MAX_CONCURRENCY = 16
+EMBEDDING_MODEL = "text-embedding-3-small"
+CV_TOKEN_BUDGET = 6000
+# Candidates sent to LLM scoring after embedding pre-ranking.
+PRE_RANK_TOP_K = 5
+PARSE_FAILED = "parse_failed"
+LLM_FALLBACK_NOTE = " | LLM parsing failed; showing heuristic extraction."
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP_TIMEOUT = 60.0
+
+JOURNALS = ("Nature", "Science", "Cell", "Lancet")
+_JOURNAL_RE = re.compile(r"\b(" + "|".join(JOURNALS) + r")\b", re.IGNORECASE)
+_KEYWORD_RE = re.compile(r"\b[A-Z][a-zA-Z]{3,}\b")
+_H_INDEX_RE = re.compile(r"H-?Index[:\s]+(\d+)", re.IGNORECASE)
 
 
 class Publication(BaseModel):
@@ -46,14 +76,56 @@ class CVProfile(BaseModel):
     grants: List[Grant] = Field(default_factory=list)
     notes: str = Field(default="")
 
+    @cached_property
+    def summary(self) -> str:
+        """Indented JSON of the profile for prompts, computed once per instance.
 
-@dataclass
+        Profiles are treated as immutable once parsed; rename before first access.
+        """
+
+        return self.model_dump_json(indent=2)
+
+
+@dataclass(frozen=True)
 class ModelConfig:
     provider: str
     model: str
     api_key: str
 
 
+T = TypeVar("T")
+Task = Literal["parse", "match", "outreach"]
+
+
+@dataclass(frozen=True)
+class TaskPreset:
+    """Generation settings for one kind of LLM call."""
+
+    temperature: float
+    max_tokens: int
+    json_mode: bool
+
+
+# Structured outputs run deterministic and capped so the model cannot ramble before the JSON.
+TASK_PRESETS: Dict[Task, TaskPreset] = {
+    "parse": TaskPreset(temperature=0.0, max_tokens=1500, json_mode=True),
+    "match": TaskPreset(temperature=0.0, max_tokens=800, json_mode=True),
+    "outreach": TaskPreset(temperature=0.2, max_tokens=1000, json_mode=False),
+}
+
+
+# Output token ceilings by model-name prefix; the first matching prefix wins.
+OUTPUT_TOKEN_LIMITS: Tuple[Tuple[str, int], ...] = (
+    ("claude-3-5-sonnet-20240620", 4096),
+    ("claude-3-5-", 8192),
+    ("claude-3-", 4096),
+    ("gpt-4o", 16384),
+    ("gpt-4-turbo", 4096),
+)
+# Conservative default for models not listed above.
+DEFAULT_OUTPUT_TOKEN_LIMIT = 4096
+
+
 def demo_profile() -> CVProfile:
     """Return a pre-filled profile for quick UI demo without uploading a PDF."""
 
@@ -75,26 +147,33 @@ def demo_profile() -> CVProfile:
     )
 
 
-def load_pdf_text(file) -> str:
-    """Extract raw text from an uploaded PDF file-like object."""
+@st.cache_data(show_spinner=False)
+def load_pdf_text(data: bytes) -> str:
+    """Extract raw text from the bytes of an uploaded PDF, cached on content across reruns."""
 
     try:
-        reader = PdfReader(file)
-        text = "\n".join(page.extract_text() or "" for page in reader.pages)
+        if fitz is not None:
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                text = "\n".join(page.get_text("text") for page in doc)
+        else:
+            # Pages share the reader's stream and object cache, so extraction must stay sequential.
+            reader = PdfReader(io.BytesIO(data), strict=False)
+            text = "\n".join(page.extract_text() or "" for page in reader.pages)
         return text.strip()
     except Exception as exc:  # pragma: no cover - defensive UI surface
         raise ValueError(f"Failed to parse PDF: {exc}")
 
 
+@st.cache_data(show_spinner=False)
 def heuristic_extract(text: str) -> CVProfile:
-    """Lightweight heuristic extraction without LLM calls."""
+    """Lightweight heuristic extraction without LLM calls, cached on the text across reruns."""
 
-    h_index_match = re.search(r"H-?Index[:\s]+(\d+)", text, flags=re.IGNORECASE)
-    keywords = list({word.strip() for word in re.findall(r"\b[A-Z][a-zA-Z]{3,}\b", text)})[:10]
-    publications = []
-    for journal in ["Nature", "Science", "Cell", "Lancet"]:
-        if re.search(journal, text, re.IGNORECASE):
-            publications.append(Publication(title=f"Highlight from {journal}", journal=journal))
+    h_index_match = _H_INDEX_RE.search(text)
+    keywords = list(set(_KEYWORD_RE.findall(text)))[:10]
+    found = {match.group(1).title() for match in _JOURNAL_RE.finditer(text)}
+    publications = [
+        Publication(title=f"Highlight from {journal}", journal=journal) for journal in JOURNALS if journal in found
+    ]
 
     return CVProfile(
         h_index=h_index_match.group(1) if h_index_match else None,
@@ -104,78 +183,447 @@ def heuristic_extract(text: str) -> CVProfile:
     )
 
 
-def get_llm(config: ModelConfig):
-    """Instantiate a chat model based on provider selection."""
+def output_token_limit(model: str) -> int:
+    """Largest ``max_tokens`` the model accepts without beta headers."""
 
-    if config.provider == "openai":
-        return ChatOpenAI(api_key=config.api_key, model=config.model, temperature=0.2)
-    if config.provider == "anthropic":
-        return ChatAnthropic(api_key=config.api_key, model=config.model, temperature=0.2)
+    for prefix, limit in OUTPUT_TOKEN_LIMITS:
+        if model.startswith(prefix):
+            return limit
+    return DEFAULT_OUTPUT_TOKEN_LIMIT
+
+
+def get_llm(config: ModelConfig, task: Task, items: int = 1):
+    """Return the chat model for the selected provider and task, shared process-wide.
+
+    ``items`` scales the task's output token cap for requests that answer for several
+    candidates at once; the result is clamped to the model's output limit.
+    """
+
+    max_tokens = min(TASK_PRESETS[task].max_tokens * items, output_token_limit(config.model))
+    return _chat_model(config.provider, config.model, config.api_key, task, max_tokens)
+
+
+@lru_cache(maxsize=1)
+def _http_client() -> httpx.Client:
+    """Process-wide keep-alive pool shared by every sync LLM client."""
+
+    return httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+@lru_cache(maxsize=16)
+def _chat_model(provider: str, model: str, api_key: str, task: Task, max_tokens: int):
+    preset = TASK_PRESETS[task]
+    if provider == "openai":
+        model_kwargs = {"response_format": {"type": "json_object"}} if preset.json_mode else {}
+        return ChatOpenAI(
+            api_key=api_key,
+            model=model,
+            temperature=preset.temperature,
+            max_tokens=max_tokens,
+            model_kwargs=model_kwargs,
+            http_client=_http_client(),
+        )
+    if provider == "anthropic":
+        return ChatAnthropic(api_key=api_key, model=model, temperature=preset.temperature, max_tokens=max_tokens)
     raise ValueError("Unsupported provider. Choose 'openai' or 'anthropic'.")
 
 
+def build_messages(system: str, payload: str, config: ModelConfig, context: Optional[str] = None) -> List[BaseMessage]:
+    """Assemble ``[system] [context] [payload]``, marking everything before the payload cacheable.
+
+    ``context`` holds data shared across candidates (target direction, institute pitch)
+    and is placed ahead of the per-candidate payload so it stays in the cached prefix.
+    Anthropic only caches blocks tagged with ``cache_control``; OpenAI caches long
+    shared prefixes automatically, so the plain string form is enough there.
+    """
+
+    if config.provider == "anthropic":
+        system_message = SystemMessage(content=[_cached_block(system)])
+        user_content = [_cached_block(context)] if context else []
+        user_content.append({"type": "text", "text": payload})
+        return [system_message, HumanMessage(content=user_content)]
+    user_text = f"{context}\n\n{payload}" if context else payload
+    return [SystemMessage(content=system), HumanMessage(content=user_text)]
+
+
+def _cached_block(text: str) -> Dict:
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def _message_text(message: BaseMessage) -> str:
+    if isinstance(message.content, str):
+        return message.content
+    return "\n\n".join(block.get("text", "") for block in message.content)
+
+
+def _cache_scope(messages: List[BaseMessage], config: ModelConfig, scope: str) -> Tuple[str, str]:
+    """Split messages into an exact cache namespace and the payload to look up.
+
+    ``scope`` carries everything that must change the answer (task inputs such as the
+    target direction, institute pitch, language and candidate identity).
+    """
+
+    system, payload = (_message_text(message) for message in messages)
+    namespace = ":".join(
+        [config.provider, config.model, ResponseCache.hash_prompt(system), ResponseCache.hash_prompt(scope)]
+    )
+    return namespace, payload
+
+
+@lru_cache(maxsize=8)
+def _embedder(config: ModelConfig) -> Optional[OpenAIEmbeddings]:
+    # Anthropic has no embeddings endpoint, so pre-ranking is skipped for it.
+    if config.provider == "openai":
+        return OpenAIEmbeddings(api_key=config.api_key, model=EMBEDDING_MODEL, http_client=_http_client())
+    return None
+
+
+def embed_profiles(profiles: Dict[str, CVProfile], config: ModelConfig) -> Dict[str, np.ndarray]:
+    """Embed each profile summary in a single batched embeddings request."""
+
+    embedder = _embedder(config)
+    if embedder is None or not profiles:
+        return {}
+    vectors = embedder.embed_documents([profile.summary for profile in profiles.values()])
+    return {name: np.asarray(vector, dtype=np.float32) for name, vector in zip(profiles, vectors)}
+
+
+def rank_candidates(embeddings: Dict[str, np.ndarray], target: str, config: ModelConfig) -> List[Tuple[str, float]]:
+    """Order candidates by cosine similarity between their profile embedding and the target direction."""
+
+    embedder = _embedder(config)
+    if embedder is None or not embeddings:
+        return []
+    query = np.asarray(embedder.embed_query(target), dtype=np.float32)
+    matrix = np.stack(list(embeddings.values()))
+    scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    order = np.argsort(-scores)
+    names = list(embeddings)
+    return [(names[idx], float(scores[idx])) for idx in order]
+
+
+@lru_cache(maxsize=1)
+def _response_cache() -> ResponseCache:
+    """Opened on first use, then shared across Streamlit reruns for the server process."""
+
+    return ResponseCache()
+
+
+def _cached_invoke(
+    llm, messages: List[BaseMessage], config: ModelConfig, scope: str, validate: Callable[[str], bool]
+) -> str:
+    """Invoke the LLM unless the identical prompt was answered before.
+
+    Only responses accepted by ``validate`` are cached, so a malformed or truncated
+    answer is retried on the next call instead of being replayed.
+    """
+
+    namespace, payload = _cache_scope(messages, config, scope)
+    cached = _response_cache().get(namespace, payload)
+    if cached is not None:
+        return cached
+    content = llm.invoke(messages).content
+    if validate(content):
+        _response_cache().put(namespace, payload, content)
+    return content
+
+
+def _cached_stream(
+    llm, messages: List[BaseMessage], config: ModelConfig, scope: str, validate: Callable[[str], bool]
+) -> Iterator[str]:
+    """Streaming counterpart of :func:`_cached_invoke`; a cache hit is yielded as one chunk."""
+
+    namespace, payload = _cache_scope(messages, config, scope)
+    cached = _response_cache().get(namespace, payload)
+    if cached is not None:
+        yield cached
+        return
+    chunks = []
+    for chunk in llm.stream(messages):
+        chunks.append(chunk.content)
+        yield chunk.content
+    content = "".join(chunks)
+    if validate(content):
+        _response_cache().put(namespace, payload, content)
+
+
+async def _acached_invoke(
+    llm, messages: List[BaseMessage], config: ModelConfig, scope: str, validate: Callable[[str], bool]
+) -> str:
+    """Async counterpart of :func:`_cached_invoke`."""
+
+    namespace, payload = _cache_scope(messages, config, scope)
+    cached = _response_cache().get(namespace, payload)
+    if cached is not None:
+        return cached
+    content = (await llm.ainvoke(messages)).content
+    if validate(content):
+        _response_cache().put(namespace, payload, content)
+    return content
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Non-OpenAI models (e.g. Claude) get a close-enough approximation.
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def truncate_to_tokens(text: str, model: str, max_tokens: int = CV_TOKEN_BUDGET) -> str:
+    """Trim ``text`` to roughly ``max_tokens``, preferring section and line boundaries.
+
+    Whole blank-line-separated sections are kept while they fit. The first section that
+    overflows contributes as many whole lines as the remaining budget allows; a single
+    line is cut mid-way only when nothing else would fit.
+    """
+
+    enc = _encoding(model)
+    kept: List[str] = []
+    used = 0
+    for section in text.split("\n\n"):
+        ids = enc.encode(section)
+        if used + len(ids) <= max_tokens:
+            kept.append(section)
+            used += len(ids)
+            continue
+        lines: List[str] = []
+        for line in section.split("\n"):
+            line_ids = enc.encode(line)
+            if used + len(line_ids) > max_tokens:
+                if not kept and not lines:
+                    lines.append(enc.decode(line_ids[: max_tokens - used]))
+                break
+            lines.append(line)
+            used += len(line_ids)
+        if lines:
+            kept.append("\n".join(lines))
+        break
+    return "\n\n".join(kept)
+
+
 def llm_structured_parse(text: str, config: ModelConfig) -> CVProfile:
-    """Use the LLM to create a structured CV profile."""
+    """Use the LLM to create a structured CV profile.
 
-    llm = get_llm(config)
-    messages = [
-        SystemMessage(content=prompts.parsing_prompt()),
-        HumanMessage(content=text[:12000]),
-    ]
-    response = llm.invoke(messages)
+    Returns an empty profile whose notes equal ``PARSE_FAILED`` when the call fails or the
+    response is not valid JSON.
+    """
+
+    llm = get_llm(config, task="parse")
+    messages = build_messages(prompts.parsing_prompt(), truncate_to_tokens(text, config.model), config)
     try:
-        parsed = json.loads(response.content)
-        return CVProfile(**parsed)
+        content = _cached_invoke(llm, messages, config, scope="parse", validate=_is_valid_profile)
+        return CVProfile.model_validate_json(content)
+    except Exception:  # network/auth/rate-limit errors and invalid JSON alike fall back to heuristics
+        return CVProfile(notes=PARSE_FAILED)
+
+
+def _is_valid_profile(content: str) -> bool:
+    try:
+        CVProfile.model_validate_json(content)
     except Exception:
-        # fall back to heuristic merge
-        base = heuristic_extract(text)
-        base.notes += " | LLM parsing failed to return valid JSON."
-        return base
-
-
-def build_candidate_table(profiles: Dict[str, CVProfile]) -> pd.DataFrame:
-    """Convert candidate profiles into a DataFrame for UI display."""
-
-    rows = []
-    for name, profile in profiles.items():
-        rows.append(
-            {
-                "Name": name,
-                "Institution": profile.current_institution,
-                "H-Index": profile.h_index,
-                "Focus": ", ".join(profile.research_focus_keywords),
-                "Publications": ", ".join(pub.journal for pub in profile.key_publications),
-            }
-        )
-    return pd.DataFrame(rows)
+        return False
+    return True
+
+
+def extract_profile(text: str, config: Optional[ModelConfig] = None) -> CVProfile:
+    """Parse CV text with the LLM when configured, running the heuristic pass only as a fallback."""
+
+    if config is not None:
+        profile = llm_structured_parse(text, config)
+        if profile.notes != PARSE_FAILED:
+            return profile
+    profile = heuristic_extract(text)
+    if config is not None:
+        profile.notes += LLM_FALLBACK_NOTE
+    return profile
+
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_candidate_table(_profiles: Dict[str, CVProfile], version: str) -> pd.DataFrame:
+    """Convert candidate profiles into a DataFrame for UI display.
 
-def generate_match_report(profile: CVProfile, target: str, config: ModelConfig) -> Dict:
-    """Produce a suitability analysis JSON using the LLM."""
+    Cached on ``version`` alone (Streamlit skips hashing underscore-prefixed arguments);
+    callers must pass a new token whenever the profile set changes.
+    """
 
-    llm = get_llm(config)
-    cv_summary = profile.json(indent=2)
-    prompt = prompts.matching_prompt(cv_summary=cv_summary, target_direction=target)
-    messages = [SystemMessage(content=prompt)]
-    response = llm.invoke(messages)
+    columns: Dict[str, list] = {"Name": [], "Institution": [], "H-Index": [], "Focus": [], "Publications": []}
+    for name, profile in _profiles.items():
+        columns["Name"].append(name)
+        columns["Institution"].append(profile.current_institution)
+        columns["H-Index"].append(profile.h_index)
+        columns["Focus"].append(", ".join(profile.research_focus_keywords))
+        columns["Publications"].append(", ".join(pub.journal for pub in profile.key_publications))
+    return pd.DataFrame(columns)
+
+
+def _match_messages(profile: CVProfile, target: str, config: ModelConfig) -> List[BaseMessage]:
+    payload = prompts.matching_payload(cv_summary=profile.summary)
+    return build_messages(prompts.matching_system_prompt(), payload, config, context=prompts.matching_context(target))
+
+
+def _match_scope(profile: CVProfile, target: str) -> str:
+    return "\x1f".join(["match", target, profile.name])
+
+
+def _is_valid_report(content: str) -> bool:
     try:
-        return json.loads(response.content)
-    except Exception:
-        return {
-            "suitability_score": "N/A",
-            "reasoning": response.content,
-            "strengths": [],
-            "gaps": [],
-            "recommended_projects": [],
-        }
-
-
-def generate_outreach(profile: CVProfile, institute_value: str, language: str, config: ModelConfig) -> str:
-    """Craft a personalized outreach email."""
-
-    llm = get_llm(config)
-    candidate_profile = profile.json(indent=2)
-    prompt = prompts.outreach_prompt(candidate_profile=candidate_profile, institute_value=institute_value, language=language)
-    messages = [SystemMessage(content=prompt)]
-    response = llm.invoke(messages)
-    return response.content
+        return isinstance(orjson.loads(content), dict)
+    except orjson.JSONDecodeError:
+        return False
+
+
+def stream_match_report(profile: CVProfile, target: str, config: ModelConfig) -> Iterator[str]:
+    """Yield the raw match report as it is generated; parse the joined text with :func:`parse_match_report`."""
+
+    llm = get_llm(config, task="match")
+    yield from _cached_stream(
+        llm,
+        _match_messages(profile, target, config),
+        config,
+        scope=_match_scope(profile, target),
+        validate=_is_valid_report,
+    )
+
+
+def parse_match_report(content: str) -> Dict:
+    """Decode a match report, wrapping non-JSON or non-object output in the report shape."""
+
+    try:
+        report = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return _fallback_report(content)
+    return report if isinstance(report, dict) else _fallback_report(content)
+
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """One long-lived loop on a daemon thread for all async LLM work.
+
+    The cached chat and embedding clients hold async HTTP connection pools bound to the
+    loop they were first used on; a fresh ``asyncio.run`` loop per click would reuse
+    connections from a closed loop.
+    """
+
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name="llm-event-loop", daemon=True).start()
+    return _LOOP
+
+
+def _run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run ``coro`` on the shared background loop and block until it finishes."""
+
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+
+def generate_match_reports_batched(
+    profiles: Dict[str, CVProfile], target: str, config: ModelConfig, batch_size: int = 8
+) -> Dict[str, Dict]:
+    """Score many candidates against one target, packing ``batch_size`` profiles per LLM call.
+
+    ``batch_size`` shrinks when the model's output limit cannot fit that many reports.
+    Batches are sent concurrently (bounded by ``MAX_CONCURRENCY``). Returns reports keyed
+    by candidate name; candidates missing from a model response, or whose request
+    failed, receive a fallback report carrying the raw output or error.
+    """
+
+    per_report = TASK_PRESETS["match"].max_tokens
+    batch_size = max(1, min(batch_size, output_token_limit(config.model) // per_report))
+    system = prompts.batch_matching_system_prompt()
+    context = prompts.matching_context(target)
+    names = list(profiles)
+    batches = [names[start : start + batch_size] for start in range(0, len(names), batch_size)]
+
+    async def _score(batch: List[str], semaphore: asyncio.Semaphore) -> Dict[str, Dict]:
+        candidates = orjson.dumps(
+            [{"id": idx, "cv": profiles[name].model_dump()} for idx, name in enumerate(batch)],
+            option=orjson.OPT_INDENT_2,
+        ).decode()
+        payload = prompts.batch_matching_payload(candidates=candidates)
+        # Reports are matched back by position, so the exact candidate order is part of the key.
+        scope = "\x1f".join(["match_batch", target, *batch])
+        llm = get_llm(config, task="match", items=len(batch))
+        try:
+            async with semaphore:
+                content = await _acached_invoke(
+                    llm,
+                    build_messages(system, payload, config, context=context),
+                    config,
+                    scope=scope,
+                    validate=lambda content: len(_parse_batch(content)) == len(batch),
+                )
+        except Exception as exc:  # keep the other batches' results when one request fails
+            return {name: _fallback_report(f"Scoring failed: {exc}") for name in batch}
+        parsed = _parse_batch(content)
+        return {name: parsed.get(idx) or _fallback_report(content) for idx, name in enumerate(batch)}
+
+    async def _gather() -> List[Dict[str, Dict]]:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        return await asyncio.gather(*(_score(batch, semaphore) for batch in batches))
+
+    reports: Dict[str, Dict] = {}
+    for batch_reports in _run_async(_gather()):
+        reports.update(batch_reports)
+    return reports
+
+
+def _parse_batch(content: str) -> Dict[int, Dict]:
+    """Map candidate ids to reports from a batch response.
+
+    Items that are not objects or lack a usable ``id`` are skipped individually, so one
+    bad entry only costs that candidate its report; a malformed response yields ``{}``.
+    """
+
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return {}
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list):
+        return {}
+    reports = {}
+    for item in results:
+        if not isinstance(item, dict):
+            continue
+        try:
+            idx = int(item.pop("id"))
+        except (KeyError, TypeError, ValueError):
+            continue
+        reports[idx] = item
+    return reports
+
+
+def _fallback_report(content: str) -> Dict:
+    """Wrap unparseable model output in the matching report shape."""
+
+    return {
+        "suitability_score": "N/A",
+        "reasoning": content,
+        "strengths": [],
+        "gaps": [],
+        "recommended_projects": [],
+    }
+
+
+def _outreach_messages(profile: CVProfile, institute_value: str, language: str, config: ModelConfig) -> List[BaseMessage]:
+    payload = prompts.outreach_payload(candidate_profile=profile.summary)
+    context = prompts.outreach_context(institute_value=institute_value, language=language)
+    return build_messages(prompts.outreach_system_prompt(), payload, config, context=context)
+
+
+def stream_outreach(profile: CVProfile, institute_value: str, language: str, config: ModelConfig) -> Iterator[str]:
+    """Yield a personalized outreach email chunk by chunk as the LLM generates it.
+
+    Drafts are deliberately not cached: each click should produce a fresh email.
+    """
+
+    llm = get_llm(config, task="outreach")
+    for chunk in llm.stream(_outreach_messages(profile, institute_value, language, config)):
+        yield chunk.content